@@ -93,7 +93,10 @@ class EasyPaste(bpy.types.Operator):
                 self.report({'ERROR'}, "Clipboard does not contain a valid file path.")
                 return {'CANCELLED'}
 
-            bpy.ops.object.select_all(action='DESELECT')
+            # Deselect directly instead of bpy.ops.object.select_all to skip
+            # operator dispatch (context push/pop, undo step registration)
+            for obj in context.selected_objects:
+                obj.select_set(False)
             start_time = time.time()
             
             bpy.ops.wm.usd_import(
@@ -62,8 +62,11 @@ def EasyPaste():
             print("ERROR: Clipboard does not contain a valid file path.")
             return
 
-        bpy.ops.object.select_all(action='DESELECT')
-        
+        # Deselect directly instead of bpy.ops.object.select_all to skip
+        # operator dispatch overhead
+        for obj in context.selected_objects:
+            obj.select_set(False)
+
         start_time = time.time()
         
         bpy.ops.wm.usd_import(
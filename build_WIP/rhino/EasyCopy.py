@@ -1,5 +1,5 @@
 #! python 3
-# r: usd-core
+# r: usd-core, xxhash, numpy
 from library import ET_rhino
 
 def RunCommand():
@@ -1,5 +1,5 @@
 #! python 3
-# r: usd-core
+# r: usd-core, xxhash, numpy
 
 import Rhino
 import Rhino.DocObjects
@@ -9,10 +9,52 @@ import System
 import time
 import struct
 import base64
+import array
+import functools
+import xxhash
+import numpy as np
 from System.Drawing import Color
 from System import Guid
 from Eto.Forms import Clipboard
-from pxr import Usd, UsdGeom, Gf, Sdf
+from pxr import Usd, UsdGeom, Gf, Sdf, Vt
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _expand_crease_keys(indices, lengths):
+    """Expands crease chains into packed uint64 (min<<32|max) edge keys."""
+    total = 0
+    for length in lengths:
+        if length > 1:
+            total += length - 1
+
+    keys = np.empty(total, dtype=np.uint64)
+    ptr = 0
+    out = 0
+    for length in lengths:
+        for i in range(length - 1):
+            a = indices[ptr + i]
+            b = indices[ptr + i + 1]
+            if a > b:
+                a, b = b, a
+            keys[out] = (a << 32) | b
+            out += 1
+        ptr += length
+    return keys
+
+
+if njit is not None:
+    _expand_crease_keys = njit(cache=True)(_expand_crease_keys)
+
+
+# Export SubD objects from the viewport's cached render mesh when one exists,
+# skipping the control-net tessellation entirely. Off by default: the control
+# net keeps exact SubD fidelity (creases, true subdivision on the other side),
+# while the render mesh ships the already-evaluated surface.
+SUBD_EXPORT_RENDER_MESH = False
 
 
 USD_TYPE_CONFIG = {
@@ -36,6 +78,11 @@ USD_TYPE_CONFIG = {
     'bool': ('?', 0)
 }
 
+# Hoisted out of the per-attribute export loop.
+_STRING_TYPE = Sdf.ValueTypeNames.String
+_USER_PREFIX = "userProperties:"
+
+
 class Attribute:
     """Handles User Attributes and Primvars."""
 
@@ -85,16 +132,35 @@ class Attribute:
         
         user_strings = attrs.GetUserStrings()
         if user_strings:
-            for key in user_strings.AllKeys:
-                val = attrs.GetUserString(key)
-                try:
-                    attr_name = f"userProperties:{key}"
-                    attr = usd_prim.CreateAttribute(attr_name, Sdf.ValueTypeNames.String)
-                    attr.Set(str(val))
-                except Exception:
-                    pass
+            # One try guards the whole loop; a single failed attribute is not
+            # recoverable here anyway.
+            try:
+                for key in user_strings.AllKeys:
+                    val = user_strings[key]
+                    attr = usd_prim.CreateAttribute(_USER_PREFIX + key, _STRING_TYPE)
+                    attr.Set(val if isinstance(val, str) else str(val))
+            except Exception:
+                pass
 
 
+    @staticmethod
+    def UserStringBlob(rh_obj):
+        """Stable bytes of an object's user strings, for the dedup digest."""
+        attrs = rh_obj.Attributes
+        if not attrs:
+            return b""
+
+        user_strings = attrs.GetUserStrings()
+        if not user_strings:
+            return b""
+
+        try:
+            pairs = sorted((key, str(user_strings[key])) for key in user_strings.AllKeys)
+        except Exception:
+            return b""
+
+        return "\x00".join(f"{k}\x00{v}" for k, v in pairs).encode("utf-8", "replace")
+
     @staticmethod
     def ImportMeshAttr(usd_prim, rh_attr):
         """Imports USD Custom Attributes and Primvars to Rhino User Strings for Meshes."""
@@ -191,41 +257,70 @@ class Attribute:
                     for obj in rh_attrs:
                         obj.SetUserString(f"{interpolation}:{base_name}[{usd_type}]", encoded_data)
             
+    # C-level translate table for the ASCII fast path in GetValidName.
+    _ASCII_TABLE = {i: (chr(i) if chr(i).isalnum() or chr(i) == '_' else '_') for i in range(128)}
+
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def GetValidName(name):
         """Sanitizes a string to be a valid USD identifier."""
         if not name:
             return None
-        
-        valid_name = "".join(c if c.isalnum() or c == '_' else '_' for c in name)
-        
+
+        if name.isascii():
+            valid_name = name.translate(Attribute._ASCII_TABLE)
+        else:
+            valid_name = "".join(c if c.isalnum() or c == '_' else '_' for c in name)
+
         if valid_name and valid_name[0].isdigit():
             valid_name = "_" + valid_name
-            
+
         return valid_name
 
 class Export:
     """Handles conversion from Rhino Geometry to USD Prims."""
+
     @staticmethod
-    def Mesh(rh_obj, stage, parent_path, name, mesh_override=None):
+    def GeometryDigest(points, face_counts, face_indices, crease_indices, user_blob, tag):
+        """Content hash of a mesh's vertex, face and crease arrays, used to detect duplicates.
+
+        The object's user strings are hashed in as well: attributes on the
+        prototype compose onto every referencing prim, so objects with
+        different metadata must never share one.
+        """
+        h = xxhash.xxh3_128(tag)
+        h.update(np.ascontiguousarray(points, dtype=np.float32).tobytes())
+        h.update(face_counts.tobytes())
+        h.update(face_indices.tobytes())
+        # Lengths and sharpnesses are derived from the indices (always 2 and
+        # 10.0 per chain), so hashing the indices covers the crease state.
+        h.update(crease_indices.tobytes())
+        h.update(user_blob)
+        return h.digest()
+
+    @staticmethod
+    def Mesh(rh_obj, stage, parent_path, name, mesh_override=None, geom_cache=None, cache_tag=b"mesh"):
         """Converts a Rhino Object's Mesh to a USD Mesh Prim."""
         mesh = mesh_override if mesh_override else rh_obj.Geometry
-        
+
         mesh_path = f"{parent_path}/{name}"
-        usd_mesh = UsdGeom.Mesh.Define(stage, mesh_path)
-        
+
         # Vertices (Topology)
+        # One numpy buffer feeds the Vt array (memcpy into USD) instead of
+        # boxing a Gf.Vec3f per vertex.
         topo_verts = mesh.TopologyVertices
-        points = [Gf.Vec3f(v.X, v.Y, v.Z) for v in topo_verts]
-        usd_mesh.CreatePointsAttr(points)
-        
-        # Helper to map mesh vertex index to topology vertex index
-        def topo_idx(idx):
-            return topo_verts.TopologyVertexIndex(idx)
-        
+        points = np.array([(v.X, v.Y, v.Z) for v in topo_verts], dtype=np.float32)
+
+        # Map mesh vertex index -> topology vertex index once; the face loops
+        # below then do plain list lookups instead of one interop call per
+        # face corner.
+        tv_map = [topo_verts.TopologyVertexIndex(i) for i in range(mesh.Vertices.Count)]
+
         # Faces
-        face_counts = []
-        face_indices = []
+        # C-typed int buffers: appends stay C-level and the final Vt arrays
+        # are built with a memcpy instead of per-int boxing through boost.
+        face_counts = array.array('i')
+        face_indices = array.array('i')
         processed_faces = set()
         
         # 1. Export Ngons (Real Ngons)
@@ -234,7 +329,7 @@ class Export:
                 v_indices = ngon.BoundaryVertexIndexList()
                 if v_indices and len(v_indices) > 0:
                     face_counts.append(len(v_indices))
-                    topo_indices = [topo_idx(vi) for vi in v_indices]
+                    topo_indices = [tv_map[vi] for vi in v_indices]
                     face_indices.extend(topo_indices)
                     
                     f_indices = ngon.FaceIndexList()
@@ -242,61 +337,82 @@ class Export:
                         processed_faces.add(f_idx)
         
         # 2. Export remaining Faces (Quads/Tris not in Ngons)
+        # One marshaled ToIntArray call exposes all faces as a flat (F,4) int
+        # buffer (tris repeat the last corner); tri detection, ngon filtering
+        # and the topology remap all run as vectorized numpy passes.
         faces = mesh.Faces
-        for i in range(faces.Count):
-            if i in processed_faces:
-                continue
-                
-            f = faces[i]
-            if f.IsQuad:
-                face_counts.append(4)
-                face_indices.extend([
-                    topo_idx(f.A), 
-                    topo_idx(f.B), 
-                    topo_idx(f.C), 
-                    topo_idx(f.D)
-                ])
-            else:
-                face_counts.append(3)
-                face_indices.extend([
-                    topo_idx(f.A), 
-                    topo_idx(f.B), 
-                    topo_idx(f.C)
-                ])
-        
-        usd_mesh.CreateFaceVertexCountsAttr(face_counts)
-        usd_mesh.CreateFaceVertexIndicesAttr(face_indices)
+        if faces.Count > 0:
+            raw = np.fromiter(faces.ToIntArray(False), dtype=np.int32, count=faces.Count * 4).reshape(-1, 4)
+            is_tri = raw[:, 2] == raw[:, 3]
+            mapped = np.asarray(tv_map, dtype=np.int32)[raw]
+
+            keep = np.ones(faces.Count, dtype=bool)
+            if processed_faces:
+                keep[np.fromiter(processed_faces, dtype=np.int64, count=len(processed_faces))] = False
+
+            corner_mask = np.ones((faces.Count, 4), dtype=bool)
+            corner_mask[is_tri, 3] = False
+
+            face_counts.frombytes(np.where(is_tri, 3, 4)[keep].astype(np.int32).tobytes())
+            face_indices.frombytes(mapped[keep][corner_mask[keep]].tobytes())
         
         # 3. Handle Creases (Unwelded Edges)
-        crease_indices = []
-        crease_lengths = []
-        crease_sharpnesses = []
-        
+        # Collected before the dedup check so the digest distinguishes meshes
+        # that share points/faces but differ in unwelded edges.
+        crease_indices = array.array('i')
+        crease_lengths = array.array('i')
+        crease_sharpnesses = array.array('f')
+
         topo_edges = mesh.TopologyEdges
-        
+
         for i in range(topo_edges.Count):
-            connected_faces = topo_edges.GetConnectedFaces(i)
-            
-            if len(connected_faces) == 2:
+            # Cheapest check first: most edges are welded, so the face and
+            # vertex lookups are skipped for them entirely.
+            if not topo_edges.IsEdgeUnwelded(i):
+                continue
+
+            if len(topo_edges.GetConnectedFaces(i)) == 2:
                 edge_topo_pair = topo_edges.GetTopologyVertices(i)
-                tv1 = edge_topo_pair.I
-                tv2 = edge_topo_pair.J
-                
-                if topo_edges.IsEdgeUnwelded(i):
-                    crease_indices.extend([tv1, tv2])
-                    crease_lengths.append(2)
-                    crease_sharpnesses.append(10.0) # Sharp
+                crease_indices.extend((edge_topo_pair.I, edge_topo_pair.J))
+                crease_lengths.append(2)
+                crease_sharpnesses.append(10.0) # Sharp
+
+        # Duplicate geometry: reference the previously emitted prim instead of
+        # re-serializing identical vertex/face arrays (blocks, scatter, copies).
+        digest = None
+        if geom_cache is not None:
+            digest = Export.GeometryDigest(points, face_counts, face_indices, crease_indices,
+                                           Attribute.UserStringBlob(rh_obj), cache_tag)
+            proto_path = geom_cache.get(digest)
+            if proto_path is not None:
+                # The referencing prim must stay untyped: a locally authored
+                # "Xform" typeName would override the referenced "Mesh" in
+                # composition and the paste side's IsA dispatch would skip it.
+                ref_prim = stage.DefinePrim(mesh_path)
+                ref_prim.GetReferences().AddInternalReference(proto_path)
+                Attribute.Export(rh_obj, ref_prim)
+                return ref_prim
+
+        usd_mesh = UsdGeom.Mesh.Define(stage, mesh_path)
+        usd_mesh.CreatePointsAttr(Vt.Vec3fArray.FromNumpy(points))
+
+        if digest is not None:
+            geom_cache[digest] = usd_mesh.GetPath()
+
+        usd_mesh.CreateFaceVertexCountsAttr(Vt.IntArray.FromNumpy(np.frombuffer(face_counts, dtype=np.int32)))
+        usd_mesh.CreateFaceVertexIndicesAttr(Vt.IntArray.FromNumpy(np.frombuffer(face_indices, dtype=np.int32)))
 
         if crease_indices:
-            usd_mesh.CreateCreaseIndicesAttr(crease_indices)
-            usd_mesh.CreateCreaseLengthsAttr(crease_lengths)
-            usd_mesh.CreateCreaseSharpnessesAttr(crease_sharpnesses)
+            usd_mesh.CreateCreaseIndicesAttr(Vt.IntArray.FromNumpy(np.frombuffer(crease_indices, dtype=np.int32)))
+            usd_mesh.CreateCreaseLengthsAttr(Vt.IntArray.FromNumpy(np.frombuffer(crease_lengths, dtype=np.int32)))
+            usd_mesh.CreateCreaseSharpnessesAttr(Vt.FloatArray.FromNumpy(np.frombuffer(crease_sharpnesses, dtype=np.float32)))
         
         usd_mesh.CreateSubdivisionSchemeAttr(UsdGeom.Tokens.none)
-        # Extent (Bounding Box)
-        bbox = mesh.GetBoundingBox(True)
-        extent = [Gf.Vec3f(bbox.Min.X, bbox.Min.Y, bbox.Min.Z), Gf.Vec3f(bbox.Max.X, bbox.Max.Y, bbox.Max.Z)]
-        usd_mesh.CreateExtentAttr(extent)
+        # Extent straight from the point buffer - one SIMD min/max pass
+        # instead of a second native bounding-box walk over the mesh.
+        if len(points):
+            extent = np.stack([points.min(axis=0), points.max(axis=0)])
+            usd_mesh.CreateExtentAttr(Vt.Vec3fArray.FromNumpy(extent))
         
         # User Attributes
         Attribute.Export(rh_obj, usd_mesh.GetPrim())
@@ -305,16 +421,30 @@ class Export:
         return usd_mesh
 
     @staticmethod
-    def SubD(rh_obj, stage, parent_path, name):
+    def SubD(rh_obj, stage, parent_path, name, geom_cache=None):
         """Converts a Rhino Object's SubD to a USD Mesh Prim with Catmull-Clark subdivision."""
         subd = rh_obj.Geometry
+
+        if SUBD_EXPORT_RENDER_MESH:
+            render_meshes = rh_obj.GetMeshes(Rhino.Geometry.MeshType.Render)
+            if render_meshes:
+                joined = Rhino.Geometry.Mesh()
+                for rm in render_meshes:
+                    joined.Append(rm)
+                # The render mesh is the evaluated surface, so it goes out as a
+                # plain mesh instead of a catmullClark control cage.
+                return Export.Mesh(rh_obj, stage, parent_path, name, mesh_override=joined, geom_cache=geom_cache)
+
         ctrl_mesh = Rhino.Geometry.Mesh.CreateFromSubDControlNet(subd)
 
-        usd_mesh = Export.Mesh(rh_obj, stage, parent_path, name, mesh_override=ctrl_mesh)
-        
-        usd_mesh.CreateSubdivisionSchemeAttr(UsdGeom.Tokens.catmullClark)
-        Attribute.Export(rh_obj, usd_mesh.GetPrim())
-        
+        usd_mesh = Export.Mesh(rh_obj, stage, parent_path, name, mesh_override=ctrl_mesh, geom_cache=geom_cache, cache_tag=b"subd")
+
+        # On a cache hit Mesh returns an untyped prim referencing the
+        # prototype, which already carries the subdivision scheme.
+        if isinstance(usd_mesh, UsdGeom.Mesh):
+            usd_mesh.CreateSubdivisionSchemeAttr(UsdGeom.Tokens.catmullClark)
+            Attribute.Export(rh_obj, usd_mesh.GetPrim())
+
         return usd_mesh
 
     @staticmethod
@@ -327,30 +457,30 @@ class Export:
         
         # 1. Points
         rh_points = geo.GetPoints()
-        points = [Gf.Vec3f(p.X, p.Y, p.Z) for p in rh_points]
-        usd_points.CreatePointsAttr(points)
-        
-        # 2. Colors 
+        points = np.array([(p.X, p.Y, p.Z) for p in rh_points], dtype=np.float32)
+        usd_points.CreatePointsAttr(Vt.Vec3fArray.FromNumpy(points))
+
+        # 2. Colors
         if geo.ContainsColors:
             rh_colors = geo.GetColors()
-            colors = [Gf.Vec3f(c.R / 255.0, c.G / 255.0, c.B / 255.0) for c in rh_colors]
-            usd_points.CreateDisplayColorAttr(colors)
-        
+            colors = np.array([(c.R, c.G, c.B) for c in rh_colors], dtype=np.float32) / 255.0
+            usd_points.CreateDisplayColorAttr(Vt.Vec3fArray.FromNumpy(colors))
+
         # 3. Normals
         if geo.ContainsNormals:
             rh_normals = geo.GetNormals()
-            normals = [Gf.Vec3f(n.X, n.Y, n.Z) for n in rh_normals]
-            usd_points.CreateNormalsAttr(normals)
+            normals = np.array([(n.X, n.Y, n.Z) for n in rh_normals], dtype=np.float32)
+            usd_points.CreateNormalsAttr(Vt.Vec3fArray.FromNumpy(normals))
         
         # 4. Widths
         if geo.ContainsPointValues:
             rh_widths = geo.GetPointValues()
             usd_points.CreateWidthsAttr(rh_widths)
             
-        # Extent
-        bbox = geo.GetBoundingBox(True)
-        extent = [Gf.Vec3f(bbox.Min.X, bbox.Min.Y, bbox.Min.Z), Gf.Vec3f(bbox.Max.X, bbox.Max.Y, bbox.Max.Z)]
-        usd_points.CreateExtentAttr(extent)
+        # Extent straight from the point buffer (see Export.Mesh)
+        if len(points):
+            extent = np.stack([points.min(axis=0), points.max(axis=0)])
+            usd_points.CreateExtentAttr(Vt.Vec3fArray.FromNumpy(extent))
         
         # User Attributes
         Attribute.Export(rh_obj, usd_points.GetPrim())
@@ -416,7 +546,14 @@ class Import:
         
         # 1. Add Points
         rh_mesh = Rhino.Geometry.Mesh()
-        rh_points = [Utility.ToRhinoPoint(p) for p in points_attr]
+        # Reserve capacity up front so the bulk adds below don't trigger
+        # geometric list reallocations.
+        rh_mesh.Vertices.Capacity = len(points_attr)
+        rh_mesh.Faces.Capacity = len(counts_attr)
+        # Pull the whole Vt buffer across in one numpy view, then build the
+        # .NET points from plain floats instead of per-component Gf reads.
+        pts_np = np.asarray(points_attr, dtype=np.float64)
+        rh_points = [Rhino.Geometry.Point3d(p[0], p[1], p[2]) for p in pts_np.tolist()]
         rh_mesh.Vertices.AddVertices(rh_points)
         
         # Add Colors
@@ -426,93 +563,102 @@ class Import:
             rh_mesh.VertexColors.AppendColors(rh_colors)
         
         # 2. Add Faces
-        mesh_faces = []
+        # Preallocate the typed .NET face array and fill it by index, so the
+        # bulk AddFaces call consumes a fixed array instead of enumerating a
+        # growing Python list.
+        total_faces = 0
+        for count in counts_attr:
+            if count < 3:
+                continue # Malformed entry; the fill pass emits no face for it
+            total_faces += count - 2 if count > 4 else 1
+
+        mesh_faces = System.Array.CreateInstance(Rhino.Geometry.MeshFace, total_faces)
         ngon_data = []
         idx_ptr = 0
+        face_ptr = 0
 
         for count in counts_attr:
+            if count < 3:
+                idx_ptr += count
+                continue
+
             if count == 3:
-                mesh_faces.append(Rhino.Geometry.MeshFace(
-                    indices_attr[idx_ptr], 
-                    indices_attr[idx_ptr + 1], 
+                mesh_faces[face_ptr] = Rhino.Geometry.MeshFace(
+                    indices_attr[idx_ptr],
+                    indices_attr[idx_ptr + 1],
                     indices_attr[idx_ptr + 2]
-                ))
-                
+                )
+                face_ptr += 1
+
             elif count == 4:
-                mesh_faces.append(Rhino.Geometry.MeshFace(
-                    indices_attr[idx_ptr], 
-                    indices_attr[idx_ptr + 1], 
-                    indices_attr[idx_ptr + 2], 
+                mesh_faces[face_ptr] = Rhino.Geometry.MeshFace(
+                    indices_attr[idx_ptr],
+                    indices_attr[idx_ptr + 1],
+                    indices_attr[idx_ptr + 2],
                     indices_attr[idx_ptr + 3]
-                ))
-                
+                )
+                face_ptr += 1
+
             else:
-                start_face_idx = len(mesh_faces) # 记录当前所在的全局面索引
+                start_face_idx = face_ptr # 记录当前所在的全局面索引
                 new_face_indices = []
-                
-                v0 = indices_attr[idx_ptr] 
-                
+
+                # Capture the boundary now; reconstruction then never has to
+                # re-derive it from per-face property reads.
+                boundary_verts = [indices_attr[idx_ptr + j] for j in range(count)]
+                v0 = boundary_verts[0]
+
                 for i in range(count - 2):
-                    mesh_faces.append(Rhino.Geometry.MeshFace(
+                    mesh_faces[face_ptr] = Rhino.Geometry.MeshFace(
                         v0,
-                        indices_attr[idx_ptr + i + 1],
-                        indices_attr[idx_ptr + i + 2]
-                    ))
+                        boundary_verts[i + 1],
+                        boundary_verts[i + 2]
+                    )
+                    face_ptr += 1
                     new_face_indices.append(start_face_idx + i)
-                    
-                ngon_data.append(new_face_indices)
+
+                ngon_data.append((new_face_indices, boundary_verts))
 
             idx_ptr += count
         rh_mesh.Faces.AddFaces(mesh_faces)
 
         # 3. Unweld Edges
-        topo_verts = rh_mesh.TopologyVertices
-        def topo_idx(idx):
-            return topo_verts.TopologyVertexIndex(idx)
-            
         crease_indices = usd_mesh_geom.GetCreaseIndicesAttr().Get()
         crease_lengths = usd_mesh_geom.GetCreaseLengthsAttr().Get()
-        
-        crease_edge= []
+
         if crease_indices and crease_lengths:
-            idx_ptr = 0
-            topo_edges = rh_mesh.TopologyEdges
-            
-            for length in crease_lengths:
-                chain = crease_indices[idx_ptr : idx_ptr + length]
-               
-                for i in range(len(chain) - 1):
-                    idx1 = chain[i]
-                    idx2 = chain[i+1]  
-                    edge_idx = topo_edges.GetEdgeIndex(topo_idx(idx1), topo_idx(idx2))
-                    if edge_idx == -1:
-                        edge_idx = topo_edges.GetEdgeIndex(topo_idx(idx2), topo_idx(idx1))
-
-                    if edge_idx != -1:
-                        crease_edge.append(edge_idx)
-                idx_ptr += length
-
-            rh_mesh.UnweldEdge(crease_edge, False)    
-
-        # 4. Reconstruct Ngons
-        if ngon_data:
-            ngons = []
-            for f_indices in ngon_data:
-                v_indices = []
-                
-                for i,face_idx in enumerate(f_indices):
-                    f = rh_mesh.Faces[face_idx]
-                    if i==0:
-                        v_indices.append(f.A)
-                        v_indices.append(f.B)
-                    elif i==len(f_indices)-1:
-                        v_indices.append(f.B)
-                        v_indices.append(f.C)
-                    else:
-                        v_indices.append(f.B)
-                    ngon = Rhino.Geometry.MeshNgon.Create(v_indices, f_indices)
-                    ngons.append(ngon)
+            # Build the mesh-vertex -> topology-vertex table once and gather
+            # the crease chains through it, then expand them into packed
+            # uint64 (min << 32 | max) keys - JIT-compiled when numba is
+            # available - so matching the mesh edges becomes one vectorized
+            # np.isin call instead of a per-pair GetEdgeIndex probe.
+            topo_verts = rh_mesh.TopologyVertices
+            tv_map = np.array(
+                [topo_verts.TopologyVertexIndex(i) for i in range(rh_mesh.Vertices.Count)],
+                dtype=np.int64
+            )
+            mapped_indices = tv_map[np.asarray(crease_indices, dtype=np.int64)]
+            crease_keys = _expand_crease_keys(mapped_indices, np.array(crease_lengths, dtype=np.int64))
+
+            if crease_keys.size:
+                # One O(E) gather of the edge endpoints, then the whole
+                # crease match is resolved without further interop calls.
+                crease_keys_np = np.unique(crease_keys)
+                topo_edges = rh_mesh.TopologyEdges
+                edge_pairs = [topo_edges.GetTopologyVertices(i) for i in range(topo_edges.Count)]
+                pairs = np.array([(p.I, p.J) for p in edge_pairs], dtype=np.uint64)
+                edge_keys = (pairs.min(axis=1) << np.uint64(32)) | pairs.max(axis=1)
 
+                crease_edge = [int(i) for i in np.nonzero(np.isin(edge_keys, crease_keys_np))[0]]
+                if crease_edge:
+                    rh_mesh.UnweldEdge(crease_edge, False)
+
+        # 4. Reconstruct Ngons (from the boundaries captured at triangulation)
+        if ngon_data:
+            ngons = [
+                Rhino.Geometry.MeshNgon.Create(boundary_verts, f_indices)
+                for f_indices, boundary_verts in ngon_data
+            ]
             rh_mesh.Ngons.AddNgons(ngons)
 
         
@@ -552,7 +698,8 @@ class Import:
             return None
             
         rh_pc = Rhino.Geometry.PointCloud()
-        rh_points = [Utility.ToRhinoPoint(p) for p in points_attr]
+        pts_np = np.asarray(points_attr, dtype=np.float64)
+        rh_points = [Rhino.Geometry.Point3d(p[0], p[1], p[2]) for p in pts_np.tolist()]
         
         # Get Attributes (Normals, Colors)
         normals_attr = usd_points_geom.GetNormalsAttr().Get()
@@ -561,26 +708,38 @@ class Import:
 
         rh_normals = None
         if normals_attr and len(normals_attr) == len(rh_points):
-            rh_normals = [Utility.ToRhinoVector(n) for n in normals_attr]
-            
+            normals_np = np.asarray(normals_attr, dtype=np.float64)
+            rh_normals = [Rhino.Geometry.Vector3d(n[0], n[1], n[2]) for n in normals_np.tolist()]
+
         rh_colors = None
         if colors_attr and len(colors_attr) == len(rh_points):
-            rh_colors = [Utility.ToColor(c) for c in colors_attr]
+            # Clamp/quantize all channels at once and pack ARGB ints, leaving
+            # only the FromArgb call per point.
+            c = (np.clip(np.asarray(colors_attr, dtype=np.float32), 0.0, 1.0) * 255).astype(np.uint32)
+            argb = np.uint32(0xFF000000) | (c[:, 0] << np.uint32(16)) | (c[:, 1] << np.uint32(8)) | c[:, 2]
+            # View as int32 so the packed values fit .NET's signed FromArgb(int).
+            rh_colors = [Color.FromArgb(a) for a in argb.view(np.int32).tolist()]
 
         rh_widths = None
         if width_attr and len(width_attr) == len(rh_points):
-            rh_widths = [w for w in width_attr]
-                
+            rh_widths = np.asarray(width_attr, dtype=np.float64).tolist()
+
+        # Hand AddRange typed .NET arrays so the bulk add marshals fixed
+        # buffers instead of enumerating Python lists item by item.
+        pts_arr = System.Array[Rhino.Geometry.Point3d](rh_points)
+        norm_arr = System.Array[Rhino.Geometry.Vector3d](rh_normals) if rh_normals else None
+        color_arr = System.Array[Color](rh_colors) if rh_colors else None
+
         if rh_normals and rh_colors and rh_widths:
-            rh_pc.AddRange(rh_points, rh_normals, rh_colors, rh_widths)
+            rh_pc.AddRange(pts_arr, norm_arr, color_arr, System.Array[System.Double](rh_widths))
         elif rh_normals and rh_colors:
-            rh_pc.AddRange(rh_points, rh_normals, rh_colors)
+            rh_pc.AddRange(pts_arr, norm_arr, color_arr)
         elif rh_normals:
-            rh_pc.AddRange(rh_points, rh_normals)
+            rh_pc.AddRange(pts_arr, norm_arr)
         elif rh_colors:
-            rh_pc.AddRange(rh_points, rh_colors)
+            rh_pc.AddRange(pts_arr, color_arr)
         else:
-            rh_pc.AddRange(rh_points)
+            rh_pc.AddRange(pts_arr)
              
         rh_attr = Rhino.DocObjects.ObjectAttributes()
         Attribute.ImportPointAttr(usd_points_geom.GetPrim(), rh_attr)
@@ -721,14 +880,17 @@ class Import:
         return list(zip(rh_curves, rh_attrs))
 
 class Utility:
+    # Row-major Transform field names; the USD matrix is transposed into this
+    # order in one numpy call instead of 16 scalar index pairs.
+    _XFORM_FIELDS = [f"M{r}{c}" for r in range(4) for c in range(4)]
+
     @staticmethod
     def ToRhinoTransform(gf_mat):
         """Converts pxr.Gf.Matrix4d to Rhino.Geometry.Transform."""
         xform = Rhino.Geometry.Transform()
-        xform.M00 = gf_mat[0][0]; xform.M01 = gf_mat[1][0]; xform.M02 = gf_mat[2][0]; xform.M03 = gf_mat[3][0]
-        xform.M10 = gf_mat[0][1]; xform.M11 = gf_mat[1][1]; xform.M12 = gf_mat[2][1]; xform.M13 = gf_mat[3][1]
-        xform.M20 = gf_mat[0][2]; xform.M21 = gf_mat[1][2]; xform.M22 = gf_mat[2][2]; xform.M23 = gf_mat[3][2]
-        xform.M30 = gf_mat[0][3]; xform.M31 = gf_mat[1][3]; xform.M32 = gf_mat[2][3]; xform.M33 = gf_mat[3][3]
+        flat = np.asarray(gf_mat, dtype=np.float64).T.ravel().tolist()
+        for field, val in zip(Utility._XFORM_FIELDS, flat):
+            setattr(xform, field, val)
         return xform
 
     @staticmethod
@@ -762,32 +924,53 @@ class Execute:
     @staticmethod
     def GetTempPath():
         home = os.path.expanduser("~")
-        path = os.path.join(home, "Desktop","_temp.usda")
+        path = os.path.join(home, "Desktop","_temp.usdc")
         return path
 
     @staticmethod
     def EasyCopy():
         start_time = time.time()
-        doc_objects = Rhino.RhinoDoc.ActiveDoc.Objects
+        doc = Rhino.RhinoDoc.ActiveDoc
+        doc_objects = doc.Objects
         rh_objs = list(doc_objects.GetSelectedObjects(False, False))
         if not rh_objs:
             print("No objects selected.")
             return
 
-        # 1. Setup Stage (In Memory)
-        stage = Usd.Stage.CreateInMemory()
+        # 1. Setup Stage (On Disk)
+        # Authoring straight into the crate layer streams writes instead of
+        # holding the whole stage in memory and serializing it again at the end.
+        file_path = Execute.GetTempPath()
+        existing_layer = Sdf.Layer.Find(file_path)
+        if existing_layer:
+            # CreateNew refuses identifiers already in the layer registry
+            # (repeat copies within one session), so clear and reuse the layer.
+            existing_layer.Clear()
+            stage = Usd.Stage.Open(existing_layer)
+        else:
+            stage = Usd.Stage.CreateNew(file_path)
         UsdGeom.SetStageUpAxis(stage, UsdGeom.Tokens.z)
         
         # Set Units
-        active_doc = Rhino.RhinoDoc.ActiveDoc
-        model_units = active_doc.ModelUnitSystem
+        model_units = doc.ModelUnitSystem
         scale_to_meters = Rhino.RhinoMath.UnitScale(model_units, Rhino.UnitSystem.Meters)
         UsdGeom.SetStageMetersPerUnit(stage, scale_to_meters)
         
         root_path = ""
         count = 0
         used_names = set()
-        
+        name_counts = {}
+        geom_cache = {}
+
+        # O(1) dispatch on the concrete geometry type instead of sequential
+        # isinstance checks; Curve keeps an isinstance fallback below since
+        # many Curve subclasses come through the document.
+        export_handlers = {
+            Rhino.Geometry.SubD: lambda obj, name: Export.SubD(obj, stage, root_path, name, geom_cache=geom_cache),
+            Rhino.Geometry.Mesh: lambda obj, name: Export.Mesh(obj, stage, root_path, name, geom_cache=geom_cache),
+            Rhino.Geometry.PointCloud: lambda obj, name: Export.PointCloud(obj, stage, root_path, name),
+        }
+
         for i, rh_obj in enumerate(rh_objs):           
             geo = rh_obj.Geometry
             
@@ -798,32 +981,33 @@ class Execute:
             if not valid_name:
                 valid_name = f"RhinoObject_{i}"
             
-            # Handle duplicates
+            # Handle duplicates: the next free suffix per base name is tracked
+            # in a dict so each assignment is O(1) instead of re-probing from
+            # _1. The set still guards against user-authored "Name_1" clashes.
             base_name = valid_name
-            dup_count = 1
-            while valid_name in used_names:
-                valid_name = f"{base_name}_{dup_count}"
+            dup_count = name_counts.get(base_name, 0)
+            while True:
+                valid_name = base_name if dup_count == 0 else f"{base_name}_{dup_count}"
                 dup_count += 1
-            
+                if valid_name not in used_names:
+                    break
+            name_counts[base_name] = dup_count
+
             used_names.add(valid_name)
             
             usd_prim = None
-            
-            if isinstance(geo, Rhino.Geometry.SubD):
-                usd_prim = Export.SubD(rh_obj, stage, root_path, valid_name)
-            elif isinstance(geo, Rhino.Geometry.Mesh):
-                usd_prim = Export.Mesh(rh_obj, stage, root_path, valid_name)
-            elif isinstance(geo, Rhino.Geometry.PointCloud):
-                usd_prim = Export.PointCloud(rh_obj, stage, root_path, valid_name)
+
+            handler = export_handlers.get(type(geo))
+            if handler:
+                usd_prim = handler(rh_obj, valid_name)
             elif isinstance(geo, Rhino.Geometry.Curve):
                 usd_prim = Export.Curve(rh_obj, stage, root_path, valid_name)
             
             if usd_prim:
                 count += 1
 
-        file_path = Execute.GetTempPath()
-        stage.GetRootLayer().Export(file_path)
-        
+        stage.Save()
+
         end_time = time.time()
         print(f"Exported {count} objects to {file_path} in {end_time - start_time:.6f} seconds")
         
@@ -850,74 +1034,115 @@ class Execute:
             print("No valid USD file found in clipboard or desktop.")
             return
 
-        # 2. Open Stage
-        stage = Usd.Stage.Open(file_path)
+        # 2. Open Stage (lazily - payloads are loaded per prim during traversal)
+        stage = Usd.Stage.Open(file_path, Usd.Stage.LoadNone)
         if not stage:
             print("Failed to open USD stage.")
             return
 
         # 3. Handle Units
+        doc = Rhino.RhinoDoc.ActiveDoc
         file_meters = UsdGeom.GetStageMetersPerUnit(stage)
-        current_meters_factor = Rhino.RhinoMath.UnitScale(Rhino.RhinoDoc.ActiveDoc.ModelUnitSystem, Rhino.UnitSystem.Meters)       
+        current_meters_factor = Rhino.RhinoMath.UnitScale(doc.ModelUnitSystem, Rhino.UnitSystem.Meters)
         world_scale = 1.0
         if current_meters_factor > 0:
             world_scale = file_meters / current_meters_factor
 
+        # Compose the unit scale once up front; per prim it is premultiplied
+        # into the USD transform (an identity scale is free inside the matmul).
+        if world_scale != 1.0:
+            scale_xform = Rhino.Geometry.Transform.Scale(Rhino.Geometry.Point3d.Origin, world_scale)
+        else:
+            scale_xform = Rhino.Geometry.Transform.Identity
+
         # 4. Traverse and Import
-        doc_objects = Rhino.RhinoDoc.ActiveDoc.Objects
+        doc_objects = doc.Objects
         doc_objects.UnselectAll()
-        
+
+        catmull_clark = UsdGeom.Tokens.catmullClark
         added_ids = []
-        
-        for prim in stage.Traverse():
-            geom_attr_pairs = []
-            
-            if prim.IsA(UsdGeom.Mesh):
-                mesh_geom = UsdGeom.Mesh(prim)
-                scheme = mesh_geom.GetSubdivisionSchemeAttr().Get()
-                if scheme == UsdGeom.Tokens.catmullClark:
-                    res = Import.SubD(mesh_geom)
-                else:
-                    res = Import.Mesh(mesh_geom)
-                if res: geom_attr_pairs.append(res)
-            elif prim.IsA(UsdGeom.Points):
-                points_geom = UsdGeom.Points(prim)
-                res = Import.Points(points_geom)
-                if res: geom_attr_pairs.append(res)
-            elif prim.IsA(UsdGeom.NurbsCurves):
-                nurbs_geom = UsdGeom.NurbsCurves(prim)
-                res_list = Import.NurbsCurves(nurbs_geom)
-                geom_attr_pairs.extend(res_list)
-            elif prim.IsA(UsdGeom.BasisCurves):
-                basis_geom = UsdGeom.BasisCurves(prim)
-                res_list = Import.BasisCurves(basis_geom)
-                geom_attr_pairs.extend(res_list)
-                
-            for geometry, attr in geom_attr_pairs:
-                # 1. Apply USD Transform (Local -> World USD)
-                xformable = UsdGeom.Xformable(prim)
-                if xformable:
-                    usd_xform = xformable.ComputeLocalToWorldTransform(Usd.TimeCode.Default())
-                    rh_xform = Utility.ToRhinoTransform(usd_xform)
-                    geometry.Transform(rh_xform)
-                
-                # 2. Apply Unit Scale (World USD -> World Rhino)
-                if world_scale != 1.0:
-                    geometry.Scale(world_scale)
-                
-                # Assign Name to Attributes
-                name_str = prim.GetName()
-                if name_str:
-                    attr.Name = name_str
 
-                guid = doc_objects.Add(geometry, attr)
-                
-                if guid != Guid.Empty:
-                    rh_obj = doc_objects.FindId(guid)
-                    if rh_obj:
-                        rh_obj.CommitChanges()
-                        rh_obj.Select(True)
+        def import_mesh_prim(prim):
+            mesh_geom = UsdGeom.Mesh(prim)
+            if mesh_geom.GetSubdivisionSchemeAttr().Get() == catmull_clark:
+                res = Import.SubD(mesh_geom)
+            else:
+                res = Import.Mesh(mesh_geom)
+            return [res] if res else []
+
+        def import_points_prim(prim):
+            res = Import.Points(UsdGeom.Points(prim))
+            return [res] if res else []
+
+        # Ordered (schema, importer) pairs replace the isinstance-style
+        # IsA chain in the traversal loop.
+        import_handlers = (
+            (UsdGeom.Mesh, import_mesh_prim),
+            (UsdGeom.Points, import_points_prim),
+            (UsdGeom.NurbsCurves, lambda p: Import.NurbsCurves(UsdGeom.NurbsCurves(p))),
+            (UsdGeom.BasisCurves, lambda p: Import.BasisCurves(UsdGeom.BasisCurves(p))),
+        )
+
+        # Batch document events: one undo record and no redraws while the
+        # stage is consumed, then a single selection and redraw at the end.
+        undo_serial = doc.BeginUndoRecord("EasyPaste")
+        doc.Views.RedrawEnabled = False
+
+        # Walk with an explicit worklist (pre-order) so the stage can recompose
+        # when a payload is loaded mid-traversal. The predicate must not filter
+        # on "loaded", otherwise unloaded payload prims would never be visited.
+        traverse_predicate = Usd.PrimIsActive & Usd.PrimIsDefined & ~Usd.PrimIsAbstract
+        worklist = list(reversed(stage.GetPseudoRoot().GetFilteredChildren(traverse_predicate)))
+
+        try:
+            while worklist:
+                prim = worklist.pop()
+
+                # Pull in this prim's payload only now that the walk reached it.
+                if prim.HasAuthoredPayloads() and not prim.IsLoaded():
+                    stage.Load(prim.GetPath())
+                    prim = stage.GetPrimAtPath(prim.GetPath())
+
+                worklist.extend(reversed(prim.GetFilteredChildren(traverse_predicate)))
+
+                geom_attr_pairs = []
+
+                for usd_type, importer in import_handlers:
+                    if prim.IsA(usd_type):
+                        geom_attr_pairs = importer(prim)
+                        break
+
+                for geometry, attr in geom_attr_pairs:
+                    # 1. Apply USD Transform + Unit Scale (Local -> World Rhino)
+                    # Premultiply the uniform unit scale into the USD transform so the
+                    # geometry is only walked once instead of Transform + Scale passes.
+                    xformable = UsdGeom.Xformable(prim)
+                    if xformable:
+                        usd_xform = xformable.ComputeLocalToWorldTransform(Usd.TimeCode.Default())
+                        rh_xform = scale_xform * Utility.ToRhinoTransform(usd_xform)
+                        geometry.Transform(rh_xform)
+                    elif world_scale != 1.0:
+                        geometry.Transform(scale_xform)
+
+                    # Assign Name to Attributes
+                    name_str = prim.GetName()
+                    if name_str:
+                        attr.Name = name_str
+
+                    # Name and user strings are already on the attributes, so no
+                    # FindId/CommitChanges round-trip is needed after the add.
+                    guid = doc_objects.Add(geometry, attr)
+
+                    if guid != Guid.Empty:
                         added_ids.append(guid)
-            
+
+            # One bulk selection instead of a per-object Select call.
+            if added_ids:
+                doc_objects.Select(added_ids)
+        finally:
+            doc.Views.RedrawEnabled = True
+            doc.EndUndoRecord(undo_serial)
+            doc.Views.Redraw()
+
         end_time = time.time()
         print(f"Imported {len(added_ids)} objects from {file_path} in {end_time - start_time:.6f} seconds")
@@ -1,10 +1,24 @@
 import json
 import os
 import requests
-import tomllib  
-import hashlib  
+import tomllib
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter, Retry
 
-ADDON_FOLDER_NAME = "EasyTransfer_blender" 
+ADDON_FOLDER_NAME = "EasyTransfer_blender"
+
+# 全局 Session: 复用 TCP/TLS 连接, 自动重试
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+))
+SESSION.headers["Accept"] = "application/vnd.github+json"
+if os.environ.get("GITHUB_TOKEN"):
+    # 有 Token 时限额从 60/h 提升到 5000/h
+    SESSION.headers["Authorization"] = f"Bearer {os.environ['GITHUB_TOKEN']}"
 
 def get_manifest_data():
     """读取本地 TOML"""
@@ -15,19 +29,61 @@ def get_manifest_data():
     with open(toml_path, "rb") as f:
         return tomllib.load(f)
 
-def get_sha256_hash(url):
-    """下载文件并计算 SHA256 (流式处理，防止内存溢出)"""
+HASH_CACHE_PATH = ".hash_cache.json"
+BUILD_STATE_PATH = ".build_state.json"
+
+def load_hash_cache():
+    """读取持久化哈希缓存 (asset id -> size/sha256)"""
+    try:
+        with open(HASH_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_hash_cache(cache):
+    with open(HASH_CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+
+def get_sha256_hash(url, etag=None, cached_hash=""):
+    """下载文件并计算 SHA256 (流式处理，防止内存溢出)
+
+    带缓存 ETag 时发条件请求: 304 直接复用缓存哈希，不传输文件体。
+    返回 (etag, hash)。
+    """
     print(f"   Calculatng hash for: {url} ...")
-    sha256_hash = hashlib.sha256()
+    headers = {"Accept": "application/octet-stream"}
+    if etag and cached_hash:
+        headers["If-None-Match"] = etag
     try:
-        with requests.get(url, stream=True) as r:
+        with SESSION.get(url, stream=True, headers=headers) as r:
+            if r.status_code == 304:
+                return etag, cached_hash
             r.raise_for_status()
-            for chunk in r.iter_content(chunk_size=8192):
-                sha256_hash.update(chunk)
-        return f"sha256:{sha256_hash.hexdigest()}"
+            new_etag = r.headers.get("ETag", "")
+            # Python 3.11+: C 层循环读入复用缓冲区，无每块 bytes 分配
+            r.raw.decode_content = True
+            digest = hashlib.file_digest(r.raw, "sha256")
+        return new_etag, f"sha256:{digest.hexdigest()}"
     except Exception as e:
         print(f"   ⚠️ Hash calculation failed: {e}")
-        return ""
+        return "", ""
+
+def serialize_index(repo_index, path):
+    """写出索引 JSON: 优先 orjson (C 实现，天然 UTF-8)，没装则退回标准库"""
+    minify = bool(os.environ.get("INDEX_MINIFY"))
+    try:
+        import orjson
+    except ImportError:
+        with open(path, "w", encoding="utf-8") as f:
+            if minify:
+                # 发布产物压缩: 客户端少下 ~25% 字节
+                json.dump(repo_index, f, separators=(",", ":"), ensure_ascii=False)
+            else:
+                json.dump(repo_index, f, indent=2, ensure_ascii=False)
+    else:
+        option = 0 if minify else orjson.OPT_INDENT_2
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(repo_index, option=option))
 
 def build_index():
     # --- 1. 读取本地 TOML ---
@@ -51,24 +107,50 @@ def build_index():
     # --- 2. 环境信息 ---
     full_repo = os.environ.get("GITHUB_REPOSITORY", "Tao-Weijie/EasyTransfer")
     current_git_tag = os.environ.get("GITHUB_REF_NAME", "")
-    user, repo = full_repo.split("/")
+    # partition 比 split 少建列表, owner/repo/extra 这种脏输入也不抛 ValueError
+    user, _, repo = full_repo.partition("/")
 
-    # --- 3. 获取 Releases ---
+    # --- 3. 获取 Releases (分页 + Session 复用连接) ---
     url = f"https://api.github.com/repos/{user}/{repo}/releases"
     print(f"Fetching releases from: {url}")
-    
-    resp = requests.get(url)
-    if resp.status_code != 200:
-        print(f"Error: {resp.status_code} {resp.text}")
-        return
 
-    releases = resp.json()
-    data_list = []
+    releases = []
+    next_url = f"{url}?per_page=100"
+    while next_url:
+        resp = SESSION.get(next_url)
+        if resp.status_code != 200:
+            print(f"Error: {resp.status_code} {resp.text}")
+            return
+
+        releases.extend(resp.json())
+        # 跟随 Link: rel="next" 直到最后一页
+        next_url = resp.links.get("next", {}).get("url")
+
+    # --- 3.5 输入无变化则跳过重建 ---
+    state_key = hashlib.sha256(json.dumps({
+        "manifest": manifest,
+        "tag": current_git_tag,
+        "releases": [
+            (r["tag_name"], [(a["id"], a["size"]) for a in r["assets"]])
+            for r in releases if not r["draft"]
+        ],
+    }, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    try:
+        with open(BUILD_STATE_PATH, "r", encoding="utf-8") as f:
+            prev_key = json.load(f).get("key")
+    except (FileNotFoundError, json.JSONDecodeError):
+        prev_key = None
 
-    # --- 4. 遍历并构建标准格式 ---
+    if prev_key == state_key and os.path.exists("index.json"):
+        print("✅ Inputs unchanged since last build, keeping existing index.json.")
+        return
+
+    # --- 4. 收集目标资源 ---
+    pending = []  # (final_version, target_asset)
     for r in releases:
         release_tag = r["tag_name"]
-        
+
         # 匹配版本号逻辑
         if release_tag == current_git_tag:
             final_version = TOML_VERSION
@@ -80,48 +162,93 @@ def build_index():
         if r["draft"]: continue
 
         # 寻找 ZIP 资源
-        target_asset = None
-        for asset in r["assets"]:
-            if "blender" in asset["name"].lower() and asset["name"].endswith(".zip"):
-                target_asset = asset
-                break
-        
+        target_asset = next(
+            (a for a in r["assets"]
+             if a["name"].endswith(".zip") and "blender" in a["name"].lower()),
+            None
+        )
+
         if target_asset:
-            dl_url = target_asset["browser_download_url"]
-            file_size = target_asset["size"] # GitHub API 直接提供大小
-
-            file_hash = get_sha256_hash(dl_url)
-
-            # === 严格对照你提供的标准格式构建 Entry ===
-            entry = {
-                "id": EXTENSION_ID,
-                "name": NAME,
-                "tagline": TAGLINE,
-                "version": final_version,
-                "type": TYPE,
-                "archive_hash": file_hash,
-                "archive_size": file_size,  
-                "archive_url": dl_url,
-                "blender_version_min": BLENDER_MIN,
-                "maintainer": MAINTAINER,
-                "tags": TAGS,
-                "license": LICENSE_LIST,    
-                "website": WEBSITE,
-                "schema_version": "1.0.0"   
-            }
-            data_list.append(entry)
-
-    # --- 5. 生成根 JSON ---
+            pending.append((final_version, target_asset))
+
+    # --- 5. 并行计算哈希 (Release 资源不可变，缓存命中则跳过下载) ---
+    cache = load_hash_cache()
+    to_hash = []
+    for _, asset in pending:
+        cached = cache.get(str(asset["id"]), {})
+        if cached.get("size") == asset["size"] and cached.get("sha256") and not cached.get("etag"):
+            continue  # 旧缓存无 ETag，按大小直接信任
+        to_hash.append(asset)
+
+    # 大文件优先入池 (LPT 调度)，避免最后一个大包拖长尾
+    to_hash.sort(key=lambda a: a["size"], reverse=True)
+
+    if to_hash:
+        def hash_asset(asset):
+            cached = cache.get(str(asset["id"]), {})
+            return get_sha256_hash(
+                asset["browser_download_url"],
+                etag=cached.get("etag"),
+                cached_hash=cached.get("sha256", "")
+            )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for asset, (etag, file_hash) in zip(to_hash, executor.map(hash_asset, to_hash)):
+                if file_hash:
+                    cache[str(asset["id"])] = {
+                        "size": asset["size"],
+                        "sha256": file_hash,
+                        "etag": etag,
+                    }
+        save_hash_cache(cache)
+
+    # --- 6. 构建标准格式 ---
+    # === 严格对照你提供的标准格式构建 Entry ===
+    # TOML 派生字段对每个 Release 都相同，只构建一次
+    base_entry = {
+        "id": EXTENSION_ID,
+        "name": NAME,
+        "tagline": TAGLINE,
+        "type": TYPE,
+        "blender_version_min": BLENDER_MIN,
+        "maintainer": MAINTAINER,
+        "tags": TAGS,
+        "license": LICENSE_LIST,
+        "website": WEBSITE,
+        "schema_version": "1.0.0"
+    }
+
+    data_list = []
+    for final_version, target_asset in pending:
+        entry = base_entry | {
+            "version": final_version,
+            "archive_hash": cache.get(str(target_asset["id"]), {}).get("sha256", ""),
+            "archive_size": target_asset["size"],  # GitHub API 直接提供大小
+            "archive_url": target_asset["browser_download_url"],
+        }
+        data_list.append(entry)
+
+    # --- 7. 生成根 JSON ---
     repo_index = {
         "version": "1",    # 列表 API 版本 (官方通常用 "1")
         "blocklist": [],   # ✅ 新增：黑名单字段 (标准格式要求)
         "data": data_list
     }
     
-    with open("index.json", "w", encoding='utf-8') as f:
-        json.dump(repo_index, f, indent=2, ensure_ascii=False)
+    serialize_index(repo_index, "index.json")
     
+    # 哈希失败会留下空 archive_hash；只有全部成功才记录状态，
+    # 否则下次运行会把坏索引当成"无变化"而跳过重建
+    if all(entry["archive_hash"] for entry in data_list):
+        with open(BUILD_STATE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"key": state_key}, f)
+    else:
+        print("⚠️ Some hashes failed; build state not saved, next run will rebuild.")
+
     print(f"✅ Generated standard index.json with {len(data_list)} items.")
 
 if __name__ == "__main__":
+    # SHA256 走 OpenSSL (新 CPU 上用 SHA-NI 指令)，打印出来便于核对 CI 环境
+    import ssl
+    print(f"hashlib backend: {ssl.OPENSSL_VERSION}")
     build_index()
\ No newline at end of file